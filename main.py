@@ -13,7 +13,8 @@ Runs the complete analysis end-to-end:
 
 Usage
 -----
-  python main.py
+  python main.py            # reuse cached ARIMA / VAR fits when the data is unchanged
+  python main.py --refit    # force both models to be re-fitted
 
 Dependencies
 ------------
@@ -22,16 +23,25 @@ Dependencies
 
 import os
 import sys
+import glob
+import argparse
+import hashlib
+import inspect
 import warnings
+import joblib
+import matplotlib
 import pandas as pd
 
 warnings.filterwarnings("ignore")
 
+# Plots are only saved to results/, never shown
+matplotlib.use("Agg")
+
 # ── allow imports from src/ ────────────────────────────────────────────────
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "src"))
 
 from data_collection  import download_data, load_data
-from preprocessing    import prepare_var_data, run_adf_tests
+from preprocessing    import prepare_var_data
 from granger_causality import granger_matrix, granger_summary
 from arima_model      import fit_arima, forecast_arima
 from var_model        import fit_var, forecast_var
@@ -45,10 +55,62 @@ from visualization    import (
     plot_return_distribution,
 )
 
-DATA_PATH = os.path.join("data", "raw_prices.csv")
-
-
-def main():
+DATA_PATH = os.path.join("data", "raw_prices.parquet")
+MODEL_CACHE_DIR = os.path.join("results", "cache")
+
+
+def _fit_cache_key(data, fit_fn, fit_kwargs: dict) -> str:
+    """
+    Hash everything a cached fit depends on: the fit function (qualified
+    name and source, so a changed implementation or return type misses),
+    its effective arguments including defaults, and the labels, index
+    and values of `data`.
+    """
+    bound = inspect.signature(fit_fn).bind(data, **fit_kwargs)
+    bound.apply_defaults()
+    params = dict(list(bound.arguments.items())[1:])
+    try:
+        source = inspect.getsource(fit_fn)
+    except (OSError, TypeError):
+        source = ""
+    labels = data.columns.tolist() if isinstance(data, pd.DataFrame) else [data.name]
+
+    h = hashlib.md5()
+    h.update(f"{fit_fn.__module__}.{fit_fn.__qualname__}".encode())
+    h.update(source.encode())
+    h.update(repr(sorted(params.items())).encode())
+    h.update(repr(labels).encode())
+    h.update(data.index.values.tobytes())
+    h.update(str(data.values.dtype).encode())
+    h.update(data.values.tobytes())
+    return h.hexdigest()[:12]
+
+
+def _load_or_fit(name: str, data, fit_fn, refit: bool = False, **fit_kwargs):
+    """
+    Return fit_fn(data, **fit_kwargs), reusing a joblib pickle when the
+    data, fit function and its arguments are unchanged.
+
+    The cache file is results/cache/{name}_{hash}.joblib; `refit=True`
+    ignores any existing file and overwrites it.  Writing a new fit removes
+    older files with the same `{name}_` prefix.
+    """
+    key = _fit_cache_key(data, fit_fn, fit_kwargs)
+    path = os.path.join(MODEL_CACHE_DIR, f"{name}_{key}.joblib")
+    if not refit and os.path.exists(path):
+        print(f"  Loading cached {name.upper()} fit from {path}")
+        return joblib.load(path)
+
+    result = fit_fn(data, **fit_kwargs)
+    os.makedirs(MODEL_CACHE_DIR, exist_ok=True)
+    for stale in glob.glob(os.path.join(MODEL_CACHE_DIR, f"{name}_*.joblib")):
+        if stale != path:
+            os.remove(stale)
+    joblib.dump(result, path, compress=3)
+    return result
+
+
+def main(refit: bool = False):
     print("=" * 65)
     print("  Bitcoin Price Forecasting – ARIMA & VAR with Granger Causality")
     print("=" * 65)
@@ -67,10 +129,9 @@ def main():
 
     # ── 2. EDA ───────────────────────────────────────────────────────────
     print("\n[2/7] Exploratory Data Analysis ...")
-    returns = prepare_var_data(prices)
+    returns, adf_summary = prepare_var_data(prices)
 
     print("\n  ─── ADF Stationarity Tests on Log-Returns ───")
-    adf_summary = run_adf_tests(returns)
     print(adf_summary.to_string())
 
     plot_prices(prices)
@@ -80,7 +141,7 @@ def main():
     # ── 3. Granger Causality ─────────────────────────────────────────────
     print("\n[3/7] Granger Causality Analysis ...")
     bool_matrix, p_matrix = granger_matrix(returns, max_lag=5)
-    gc_summary = granger_summary(returns, max_lag=5)
+    gc_summary = granger_summary(returns, max_lag=5, p_matrix=p_matrix)
 
     print("\n  ─── Granger Causality p-value Matrix (row → column) ───")
     print(p_matrix.to_string())
@@ -92,8 +153,13 @@ def main():
 
     # ── 4. ARIMA ─────────────────────────────────────────────────────────
     print("\n[4/7] ARIMA Model ...")
-    arima_fitted, arima_order = fit_arima(prices["Bitcoin"])
-    arima_fc = forecast_arima(arima_fitted, last_price=prices["Bitcoin"].iloc[-1])
+    arima_fitted, arima_order = _load_or_fit("arima", prices["Bitcoin"], fit_arima, refit)
+    print(f"  ARIMA order: {arima_order}")
+    arima_fc = forecast_arima(
+        arima_fitted,
+        last_price=prices["Bitcoin"].iloc[-1],
+        last_date=prices.index[-1],
+    )
 
     print("\n  ─── ARIMA 30-Day Forecast (USD) ───")
     print(arima_fc.round(2).to_string())
@@ -102,7 +168,8 @@ def main():
 
     # ── 5. VAR ───────────────────────────────────────────────────────────
     print("\n[5/7] VAR Model ...")
-    var_fitted, var_lag = fit_var(returns)
+    var_fitted, var_lag = _load_or_fit("var", returns, fit_var, refit)
+    print(f"  VAR lag order: {var_lag}")
     var_fc = forecast_var(var_fitted, returns, prices)
 
     print("\n  ─── VAR 30-Day Forecast (USD) ───")
@@ -116,11 +183,10 @@ def main():
 
     # ── 7. Save Summary CSV ──────────────────────────────────────────────
     print("\n[7/7] Saving forecast summary ...")
-    arima_fc_labeled         = arima_fc.copy()
-    arima_fc_labeled.columns = [f"ARIMA_{c}" for c in arima_fc.columns]
-    var_fc_labeled           = var_fc.copy()
-    var_fc_labeled.columns   = [f"VAR_{c}"   for c in var_fc.columns]
-    combined = pd.concat([arima_fc_labeled, var_fc_labeled], axis=1)
+    combined = pd.DataFrame(
+        {f"ARIMA_{c}": arima_fc[c] for c in arima_fc.columns}
+        | {f"VAR_{c}": var_fc[c] for c in var_fc.columns}
+    )
     out_path = os.path.join("results", "forecast_summary.csv")
     combined.round(2).to_csv(out_path)
     print(f"  Saved → {out_path}")
@@ -133,4 +199,10 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Bitcoin price forecasting pipeline")
+    parser.add_argument(
+        "--refit", action="store_true",
+        help="re-fit ARIMA and VAR even if a cached fit for this data exists",
+    )
+    args = parser.parse_args()
+    main(refit=args.refit)
@@ -2,8 +2,10 @@
 ARIMA Forecasting Module
 =========================
 Fits an ARIMA(p,d,q) model to Bitcoin log-prices (levels) using
-pmdarima's auto_arima for automatic order selection, then forecasts
-the next 30 days with a 95 % confidence interval.
+statsforecast's AutoARIMA (Numba-compiled Hyndman-Khandakar search)
+for automatic order selection, then forecasts
+the next 30 days with a 95 % confidence interval directly from the
+selected model (no separate statsmodels refit).
 
 The forecast is converted back to price levels for interpretability.
 """
@@ -11,8 +13,8 @@ The forecast is converted back to price levels for interpretability.
 import numpy as np
 import pandas as pd
 import warnings
-import pmdarima as pm
-from statsmodels.tsa.arima.model import ARIMA
+from statsforecast.models import AutoARIMA
+from threadpoolctl import threadpool_limits
 
 warnings.filterwarnings("ignore")
 
@@ -22,7 +24,7 @@ def fit_arima(
     seasonal: bool = False,
 ) -> tuple:
     """
-    Fit ARIMA to log(Bitcoin price) using auto_arima order selection.
+    Fit ARIMA to log(Bitcoin price) using AutoARIMA order selection.
 
     Parameters
     ----------
@@ -31,31 +33,29 @@ def fit_arima(
 
     Returns
     -------
-    (fitted_model, (p, d, q))
+    (fitted AutoARIMA, (p, d, q))
     """
-    log_prices = np.log(bitcoin_prices)
-
-    print("  Running auto_arima order selection ...")
-    auto = pm.auto_arima(
-        log_prices,
-        start_p=0, start_q=0,
-        max_p=5,   max_q=5,
-        d=None,
-        seasonal=seasonal,
-        information_criterion="aic",
-        stepwise=True,
-        suppress_warnings=True,
-        error_action="ignore",
-        trace=False,
-    )
-    order = auto.order
+    log_prices = np.log(bitcoin_prices.astype(np.float64))
+
+    print("  Running AutoARIMA order selection ...")
+    # The order search itself runs in Numba; this only caps the NumPy
+    # linear algebra AutoARIMA calls around it
+    with threadpool_limits(limits=1, user_api="blas"):
+        auto = AutoARIMA(
+            start_p=0, start_q=0,
+            max_p=5,   max_q=5,
+            d=None,
+            seasonal=seasonal,
+            ic="aic",
+            stepwise=True,
+        )
+        auto.fit(log_prices.values)
+        # arma = (p, q, P, Q, season_length, d, D)
+        p, q, _, _, _, d, _ = auto.model_["arma"]
+    order = (p, d, q)
     print(f"  Best ARIMA order selected: {order}")
-
-    # Refit with statsmodels for richer in-sample diagnostics / CI
-    model = ARIMA(log_prices, order=order)
-    fitted = model.fit()
-    print(fitted.summary())
-    return fitted, order
+    print(f"  AIC: {auto.model_['aic']:.2f}  |  sigma²: {auto.model_['sigma2']:.6g}")
+    return auto, order
 
 
 def forecast_arima(
@@ -63,6 +63,8 @@ def forecast_arima(
     last_price: float,
     steps: int = 30,
     alpha: float = 0.05,
+    *,
+    last_date: pd.Timestamp,
 ) -> pd.DataFrame:
     """
     Produce an h-step-ahead forecast with (1-alpha) confidence interval,
@@ -70,35 +72,36 @@ def forecast_arima(
 
     Parameters
     ----------
-    fitted_model : statsmodels ARIMA result
-    last_price   : float  last observed BTC price (for display only)
-    steps        : int    forecast horizon (default 30 days)
-    alpha        : float  significance level (default 0.05 → 95% CI)
+    fitted_model : fitted statsforecast AutoARIMA (from `fit_arima`)
+    last_price   : float         last observed BTC price (for display only)
+    steps        : int           forecast horizon (default 30 days)
+    alpha        : float         significance level (default 0.05 → 95% CI)
+    last_date    : pd.Timestamp  keyword-only; date of the last observation
+                                 (the model is fitted on a bare array and
+                                 has no index)
 
     Returns
     -------
     pd.DataFrame  columns: [Forecast, Lower_CI, Upper_CI]
     """
-    forecast_obj = fitted_model.get_forecast(steps=steps)
-    mean_log = forecast_obj.predicted_mean
-    ci_log   = forecast_obj.conf_int(alpha=alpha)
+    level = 100 * (1 - alpha)
+    forecast_obj = fitted_model.predict(h=steps, level=[level])
 
     # Back-transform
-    forecast_price = np.exp(mean_log)
-    lower_price    = np.exp(ci_log.iloc[:, 0])
-    upper_price    = np.exp(ci_log.iloc[:, 1])
+    forecast_price = np.exp(np.asarray(forecast_obj["mean"]))
+    lower_price    = np.exp(np.asarray(forecast_obj[f"lo-{level}"]))
+    upper_price    = np.exp(np.asarray(forecast_obj[f"hi-{level}"]))
 
     # Build a date index starting the day after the last observed date
-    last_date = fitted_model.model.data.dates[-1]
     future_dates = pd.date_range(
         start=last_date + pd.Timedelta(days=1), periods=steps, freq="D"
     )
 
     result = pd.DataFrame(
         {
-            "Forecast":  forecast_price.values,
-            "Lower_CI":  lower_price.values,
-            "Upper_CI":  upper_price.values,
+            "Forecast":  forecast_price,
+            "Lower_CI":  lower_price,
+            "Upper_CI":  upper_price,
         },
         index=future_dates,
     )
@@ -112,5 +115,5 @@ if __name__ == "__main__":
     prices = download_data()
     btc = prices["Bitcoin"]
     fitted, order = fit_arima(btc)
-    fc = forecast_arima(fitted, last_price=btc.iloc[-1])
+    fc = forecast_arima(fitted, last_price=btc.iloc[-1], last_date=btc.index[-1])
     print(fc)
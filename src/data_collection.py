@@ -7,11 +7,26 @@ Downloads historical price data for Bitcoin and macroeconomic variables:
   - Gold Futures (GC=F)
   - S&P 500 Index (^GSPC)
   - Crude Oil Futures (CL=F)
+
+Each ticker's closes are cached in data/cache/{label}.parquet, next to a
+{label}.json sidecar recording the date range already requested from
+Yahoo.  Warm runs only fetch the part of [start, end) not yet covered,
+with all stale tickers batched into a single Yahoo request.  A top-up
+that comes back empty only extends coverage when the ticker had no
+trading sessions in the window (see `_sessions`).
 """
 
 import yfinance as yf
+import numpy as np
 import pandas as pd
+import json
 import os
+from pandas.tseries.holiday import (
+    AbstractHolidayCalendar, Holiday, nearest_workday, sunday_to_monday,
+    USMartinLutherKingJr, USPresidentsDay, GoodFriday, USMemorialDay,
+    USLaborDay, USThanksgivingDay,
+)
+from pandas.tseries.offsets import CustomBusinessDay
 
 
 TICKERS = {
@@ -24,6 +39,78 @@ TICKERS = {
 
 START_DATE = "2018-01-01"
 END_DATE   = "2024-12-31"
+CACHE_DIR  = os.path.join("data", "cache")
+
+
+class _ExchangeHolidays(AbstractHolidayCalendar):
+    """Full-day NYSE closures, used as the calendar for non-crypto tickers."""
+    rules = [
+        Holiday("NewYearsDay", month=1, day=1, observance=sunday_to_monday),
+        USMartinLutherKingJr,
+        USPresidentsDay,
+        GoodFriday,
+        USMemorialDay,
+        Holiday("Juneteenth", month=6, day=19, start_date="2022-01-01",
+                observance=nearest_workday),
+        Holiday("IndependenceDay", month=7, day=4, observance=nearest_workday),
+        USLaborDay,
+        USThanksgivingDay,
+        Holiday("Christmas", month=12, day=25, observance=nearest_workday),
+    ]
+
+
+def _sessions(symbol: str, start: pd.Timestamp, end: pd.Timestamp) -> pd.DatetimeIndex:
+    """
+    Days in [start, end) on which `symbol` is expected to have a close.
+
+    Yahoo crypto pairs (``XXX-USD``) trade every calendar day; everything
+    else follows the exchange calendar (weekdays minus `_ExchangeHolidays`).
+    """
+    if symbol.endswith("-USD"):
+        return pd.date_range(start, end, inclusive="left")
+    days = pd.date_range(
+        start, end, freq=CustomBusinessDay(calendar=_ExchangeHolidays())
+    )
+    return days[days < end]
+
+
+def _read_cache(label: str, start: pd.Timestamp, cache_dir: str) -> tuple:
+    """
+    Return (cached_series_or_None, covered_start, fetch_start) for one ticker.
+
+    Coverage is the [start, end) range previously requested, read from the
+    sidecar rather than from the first / last rows, since those fall on
+    trading days only.  Without a usable cache both dates are `start`.
+    """
+    path = os.path.join(cache_dir, f"{label}.parquet")
+    meta_path = os.path.join(cache_dir, f"{label}.json")
+    if os.path.exists(path) and os.path.exists(meta_path):
+        with open(meta_path) as f:
+            meta = json.load(f)
+        covered_start = pd.Timestamp(meta["start"])
+        if covered_start <= start:
+            cached = pd.read_parquet(path)[label]
+            return cached, covered_start, pd.Timestamp(meta["end"])
+    return None, start, start
+
+
+def _write_cache(
+    label: str,
+    series: pd.Series,
+    covered_start: pd.Timestamp,
+    covered_end: pd.Timestamp,
+    cache_dir: str,
+):
+    """Write one ticker's closes and the [start, end) range they cover."""
+    os.makedirs(cache_dir, exist_ok=True)
+    series.to_frame().to_parquet(
+        os.path.join(cache_dir, f"{label}.parquet"),
+        engine="pyarrow", compression="snappy",
+    )
+    with open(os.path.join(cache_dir, f"{label}.json"), "w") as f:
+        json.dump(
+            {"start": str(covered_start.date()), "end": str(covered_end.date())}, f
+        )
 
 
 def download_data(
@@ -31,55 +118,110 @@ def download_data(
     start: str = START_DATE,
     end: str = END_DATE,
     save_path: str = None,
+    cache_dir: str = CACHE_DIR,
 ) -> pd.DataFrame:
     """
     Download adjusted closing prices for all tickers and merge into one DataFrame.
 
+    Closes are cached per ticker as parquet under `cache_dir`.  Tickers whose
+    cached range does not reach `end` are refreshed together in one
+    multi-ticker `yf.download` call.
+
     Parameters
     ----------
-    tickers : dict  {label: yfinance_symbol}
-    start   : str   start date  (YYYY-MM-DD)
-    end     : str   end date    (YYYY-MM-DD)
-    save_path : str optional CSV output path
+    tickers   : dict  {label: yfinance_symbol}
+    start     : str   start date  (YYYY-MM-DD)
+    end       : str   end date    (YYYY-MM-DD)
+    save_path : str   optional parquet output path
+    cache_dir : str   directory for the per-ticker parquet cache
 
     Returns
     -------
-    pd.DataFrame  daily closing prices, forward-filled, dropna
+    pd.DataFrame  daily closing prices (float32), forward-filled, dropna
     """
-    frames = {}
-    for label, symbol in tickers.items():
-        print(f"  Downloading {label} ({symbol}) ...")
-        raw = yf.download(symbol, start=start, end=end, auto_adjust=True, progress=False)
-        if raw.empty:
-            print(f"    WARNING: no data returned for {symbol}")
-            continue
-        # yfinance may return MultiIndex columns – flatten
-        if isinstance(raw.columns, pd.MultiIndex):
-            raw.columns = raw.columns.get_level_values(0)
-        frames[label] = raw["Close"].rename(label)
-
+    start, end = pd.Timestamp(start), pd.Timestamp(end)
+    # Days from today onward have no final close yet; leave them uncovered
+    covered_end = min(end, pd.Timestamp.today().normalize())
+
+    cached, covered_start, stale = {}, {}, {}
+    for label in tickers:
+        cached[label], covered_start[label], fetch_start = _read_cache(
+            label, start, cache_dir
+        )
+        if fetch_start < end:
+            stale[label] = fetch_start
+        else:
+            print(f"  {label} ({tickers[label]}) up to date in cache")
+
+    if stale:
+        fetch_start = min(stale.values())
+        print(f"  Downloading {', '.join(stale)} from {fetch_start.date()} ...")
+        raw = yf.download(
+            " ".join(tickers[label] for label in stale),
+            start=fetch_start, end=end, auto_adjust=True, progress=False,
+            group_by="ticker", threads=True,
+        )
+        # A single-symbol request may come back with flat columns
+        if not isinstance(raw.columns, pd.MultiIndex):
+            raw = pd.concat({tickers[next(iter(stale))]: raw}, axis=1)
+
+        for label in stale:
+            symbol = tickers[label]
+            returned = symbol in raw.columns.get_level_values(0)
+            fresh = (
+                raw[symbol]["Close"].dropna().rename(label)
+                if returned else pd.Series(dtype=float)
+            )
+            # An empty top-up only counts as covered when the window holds
+            # no trading sessions for this ticker (e.g. a weekend or holiday
+            # for an exchange ticker); otherwise the ticker failed (yfinance
+            # reports that as an all-NaN column) and the range is left
+            # uncovered so the next run retries it
+            window = _sessions(symbol, stale[label], covered_end)
+            if not returned or (fresh.empty and (cached[label] is None or len(window))):
+                print(f"    WARNING: no data returned for {symbol}")
+                continue
+            merged = fresh if cached[label] is None else pd.concat([cached[label], fresh])
+            merged = merged[~merged.index.duplicated(keep="last")].sort_index()
+            merged.index.name = "Date"
+            _write_cache(label, merged, covered_start[label], covered_end, cache_dir)
+            cached[label] = merged
+
+    frames = {
+        label: series[(series.index >= start) & (series.index < end)]
+        for label, series in cached.items()
+        if series is not None
+    }
     df = pd.concat(frames.values(), axis=1)
     df.index = pd.to_datetime(df.index)
     df.index.name = "Date"
 
-    # Forward-fill weekends / holidays, then drop any remaining NaN rows
-    df = df.ffill().dropna()
+    # Forward-fill weekends / holidays, then drop any remaining NaN rows.
+    # Vectorised: each cell takes the value at the running max of the
+    # row positions where its column was last observed.
+    arr = df.to_numpy(dtype=np.float64)
+    rows = np.where(~np.isnan(arr), np.arange(len(arr))[:, None], 0)
+    np.maximum.accumulate(rows, axis=0, out=rows)
+    arr = arr[rows, np.arange(arr.shape[1])]
+    df = pd.DataFrame(arr, index=df.index, columns=df.columns).dropna()
+    # float32 holds ~7 significant digits, ample for closing prices
+    df = df.astype(np.float32)
 
     if save_path:
         os.makedirs(os.path.dirname(save_path), exist_ok=True)
-        df.to_csv(save_path)
+        df.to_parquet(save_path, engine="pyarrow", compression="snappy")
         print(f"  Data saved to {save_path}")
 
     print(f"  Dataset shape: {df.shape}  |  {df.index[0].date()} → {df.index[-1].date()}")
     return df
 
 
-def load_data(csv_path: str) -> pd.DataFrame:
-    """Load a previously saved CSV."""
-    df = pd.read_csv(csv_path, index_col="Date", parse_dates=True)
+def load_data(path: str) -> pd.DataFrame:
+    """Load a previously saved parquet file as float32 prices."""
+    df = pd.read_parquet(path).astype(np.float32)
     return df
 
 
 if __name__ == "__main__":
-    df = download_data(save_path="../data/raw_prices.csv")
+    df = download_data(save_path="../data/raw_prices.parquet")
     print(df.tail())
@@ -4,28 +4,38 @@ Preprocessing & Stationarity Module
 - Computes log returns
 - Runs Augmented Dickey-Fuller (ADF) tests
 - Differencing utilities
+
+The ADF regression uses a fixed lag length (ADF_MAXLAG = 5, i.e. one
+trading week) rather than an AIC search over every lag up to Schwert's
+12 * (nobs/100)^(1/4), so each series needs a single OLS fit.
 """
 
 import pandas as pd
 import numpy as np
 from statsmodels.tsa.stattools import adfuller
 
+ADF_MAXLAG = 5
+
 
 def log_returns(df: pd.DataFrame) -> pd.DataFrame:
     """
-    Convert price levels to log returns: r_t = ln(P_t / P_{t-1}).
-    First row will be NaN and is dropped.
+    Convert price levels to log returns: r_t = ln(P_t) - ln(P_{t-1}).
+    The first date has no prior price, so the result starts one row later.
+    NaNs are not dropped: a missing price yields NaN in the returns on
+    either side of it.
     """
-    return np.log(df / df.shift(1)).dropna()
+    arr = np.log(df.to_numpy(dtype=np.float64))
+    r = np.diff(arr, axis=0)
+    return pd.DataFrame(r, index=df.index[1:], columns=df.columns)
 
 
 def adf_test(series: pd.Series, label: str = "") -> dict:
     """
-    Augmented Dickey-Fuller test for stationarity.
+    Augmented Dickey-Fuller test for stationarity, with ADF_MAXLAG lags.
 
     Returns a dict with test stat, p-value, critical values, and verdict.
     """
-    result = adfuller(series.dropna(), autolag="AIC")
+    result = adfuller(series.dropna().values, maxlag=ADF_MAXLAG, autolag=None)
     verdict = "Stationary" if result[1] < 0.05 else "Non-Stationary"
     out = {
         "Series":       label or series.name,
@@ -45,10 +55,16 @@ def run_adf_tests(df: pd.DataFrame) -> pd.DataFrame:
     return pd.DataFrame(rows).set_index("Series")
 
 
-def prepare_var_data(prices: pd.DataFrame) -> pd.DataFrame:
+def prepare_var_data(prices: pd.DataFrame) -> tuple:
     """
-    Return stationary log-return series ready for VAR estimation.
-    Drops the first NaN row introduced by differencing.
+    Return stationary log-return series ready for VAR estimation,
+    together with the ADF summary computed on them.
+    Expects gap-free prices (as from `download_data`); NaN prices are
+    passed through to the returns.
+
+    Returns
+    -------
+    (pd.DataFrame, pd.DataFrame)  log returns, ADF summary
     """
     returns = log_returns(prices)
     adf_summary = run_adf_tests(returns)
@@ -56,11 +72,11 @@ def prepare_var_data(prices: pd.DataFrame) -> pd.DataFrame:
     if not non_stat.empty:
         print("WARNING: the following log-return series are still non-stationary:")
         print(non_stat)
-    return returns
+    return returns, adf_summary
 
 
 if __name__ == "__main__":
     from data_collection import download_data
     prices = download_data()
-    returns = prepare_var_data(prices)
-    print(run_adf_tests(returns))
+    returns, adf_summary = prepare_var_data(prices)
+    print(adf_summary)
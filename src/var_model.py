@@ -12,6 +12,7 @@ import pandas as pd
 import warnings
 from statsmodels.tsa.api import VAR
 from statsmodels.tsa.stattools import adfuller
+from threadpoolctl import threadpool_limits
 
 warnings.filterwarnings("ignore")
 
@@ -35,11 +36,14 @@ def fit_var(
     (VARResultsWrapper, int)  fitted model, selected lag order
     """
     model = VAR(returns)
-    lag_results = model.select_order(maxlags=maxlags)
-    selected_lag = lag_results.selected_orders[ic]
-    print(f"  VAR lag order selected by {ic.upper()}: {selected_lag}")
-
-    fitted = model.fit(selected_lag)
+    # select_order refits OLS for every lag up to maxlags on a k*p-column
+    # design; at this size BLAS threads cost more to start than they save
+    with threadpool_limits(limits=1, user_api="blas"):
+        lag_results = model.select_order(maxlags=maxlags)
+        selected_lag = lag_results.selected_orders[ic]
+        print(f"  VAR lag order selected by {ic.upper()}: {selected_lag}")
+
+        fitted = model.fit(selected_lag)
     print(fitted.summary())
     return fitted, selected_lag
 
@@ -84,12 +88,12 @@ def forecast_var(
     z = 1.959964                                              # 97.5th percentile → 95% CI
 
     # Cumulative sum of log-returns → log-price forecast
-    last_log_price = np.log(prices["Bitcoin"].iloc[-1])
+    last_log_price = np.log(float(prices["Bitcoin"].iloc[-1]))   # float32 storage → float64
     cum_returns    = fc_df["Bitcoin"].cumsum().values
 
     # Standard error grows with cumulative sum (assumes independence across steps)
     # Σ of cumulative return variance = Σ_{t=1}^{h} Var[r_t]
-    step_var   = np.array([fc_cov[t][btc_idx, btc_idx] for t in range(steps)])
+    step_var   = fc_cov[:, btc_idx, btc_idx]
     cum_var    = np.cumsum(step_var)
     cum_se     = np.sqrt(cum_var)
 
@@ -120,7 +124,7 @@ if __name__ == "__main__":
     from preprocessing import prepare_var_data
 
     prices  = download_data()
-    returns = prepare_var_data(prices)
+    returns, _ = prepare_var_data(prices)
     fitted, lag = fit_var(returns)
     fc = forecast_var(fitted, returns, prices)
     print(fc)
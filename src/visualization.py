@@ -48,7 +48,10 @@ def plot_prices(prices: pd.DataFrame, save: bool = True):
 
 def plot_correlation(returns: pd.DataFrame, save: bool = True):
     """Correlation heat-map of log-return series."""
-    corr = returns.corr()
+    corr = pd.DataFrame(
+        np.corrcoef(returns.to_numpy().T),
+        index=returns.columns, columns=returns.columns,
+    )
     mask = np.triu(np.ones_like(corr, dtype=bool))
     fig, ax = plt.subplots(figsize=(8, 6))
     sns.heatmap(
@@ -71,7 +74,8 @@ def plot_granger(p_matrix: pd.DataFrame, alpha: float = 0.05, save: bool = True)
     Cells below alpha are highlighted (significant causality).
     """
     fig, ax = plt.subplots(figsize=(8, 6))
-    annot = p_matrix.applymap(lambda x: f"{x:.3f}" if pd.notna(x) else "–")
+    vals  = p_matrix.to_numpy(dtype=float)
+    annot = np.where(np.isnan(vals), "–", np.char.mod("%.3f", np.nan_to_num(vals)))
     cmap  = sns.diverging_palette(10, 130, as_cmap=True)
     sns.heatmap(
         p_matrix.astype(float), annot=annot, fmt="", cmap=cmap,